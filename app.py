@@ -32,7 +32,11 @@ from utils.dependencies import check_tool, check_all_dependencies, TOOL_DEPENDEN
 from utils.process import cleanup_stale_processes
 from utils.sdr import SDRFactory
 from utils.cleanup import DataStore, cleanup_manager
+from utils.adsb_table import AircraftTable
+from utils.sse import SSEBroadcast
 from utils.constants import (
+    ADSB_FULL_UPDATE_SECONDS,
+    ADSB_TABLE_CAPACITY,
     MAX_AIRCRAFT_AGE_SECONDS,
     MAX_WIFI_NETWORK_AGE_SECONDS,
     MAX_BT_DEVICE_AGE_SECONDS,
@@ -40,6 +44,7 @@ from utils.constants import (
     MAX_DSC_MESSAGE_AGE_SECONDS,
     MAX_DEAUTH_ALERTS_AGE_SECONDS,
     QUEUE_MAX_SIZE,
+    SSE_BROADCAST_BUFFER_SIZE,
 )
 import logging
 from flask_limiter import Limiter
@@ -135,9 +140,9 @@ bt_process = None
 bt_queue = queue.Queue(maxsize=QUEUE_MAX_SIZE)
 bt_lock = threading.Lock()
 
-# ADS-B aircraft
+# ADS-B aircraft (frames are serialised once and shared by all SSE clients)
 adsb_process = None
-adsb_queue = queue.Queue(maxsize=QUEUE_MAX_SIZE)
+adsb_stream = SSEBroadcast(maxlen=SSE_BROADCAST_BUFFER_SIZE)
 adsb_lock = threading.Lock()
 
 # Satellite/Iridium
@@ -209,6 +214,12 @@ bt_services = {}     # MAC -> list of services (not auto-cleaned, user-requested
 
 # Aircraft (ADS-B) state - using DataStore for automatic cleanup
 adsb_aircraft = DataStore(max_age_seconds=MAX_AIRCRAFT_AGE_SECONDS, name='adsb_aircraft')
+# Per-message aircraft state written by the SBS parser; adsb_aircraft holds the published snapshots
+adsb_table = AircraftTable(
+    capacity=ADSB_TABLE_CAPACITY,
+    max_age_seconds=MAX_AIRCRAFT_AGE_SECONDS,
+    full_update_seconds=ADSB_FULL_UPDATE_SECONDS,
+)
 
 # Vessel (AIS) state - using DataStore for automatic cleanup
 ais_vessels = DataStore(max_age_seconds=MAX_VESSEL_AGE_SECONDS, name='ais_vessels')
@@ -696,6 +707,8 @@ def kill_all() -> Response:
     with adsb_lock:
         adsb_process = None
         adsb_module.adsb_using_service = False
+        adsb_module.adsb_stop_event.set()
+        adsb_module.invalidate_sbs_probe()
 
     # Reset AIS state
     with ais_lock:
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 import os
-import queue
+import selectors
 import shutil
 import socket
 import subprocess
@@ -26,6 +26,12 @@ except ImportError:
     RealDictCursor = None  # type: ignore
     PSYCOPG2_AVAILABLE = False
 
+# orjson is optional - only used to speed up ADS-B SSE serialisation
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 import app as app_module
 from config import (
     ADSB_DB_HOST,
@@ -43,6 +49,7 @@ from utils.validation import (
     validate_rtl_tcp_host, validate_rtl_tcp_port
 )
 from utils.sse import format_sse
+from utils.sbs_parse import parse_sbs_line
 from utils.event_pipeline import process_event
 from utils.sdr import SDRFactory, SDRType
 from utils.constants import (
@@ -51,10 +58,12 @@ from utils.constants import (
     PROCESS_TERMINATE_TIMEOUT,
     SBS_SOCKET_TIMEOUT,
     SBS_RECONNECT_DELAY,
-    SOCKET_BUFFER_SIZE,
+    SBS_SO_RCVBUF,
+    SBS_READ_BUFFER_SIZE,
     SSE_KEEPALIVE_INTERVAL,
     SSE_QUEUE_TIMEOUT,
-    SOCKET_CONNECT_TIMEOUT,
+    SBS_PROBE_TIMEOUT,
+    SBS_PROBE_CACHE_SECONDS,
     ADSB_UPDATE_INTERVAL,
     DUMP1090_START_WAIT,
 )
@@ -65,6 +74,9 @@ adsb_bp = Blueprint('adsb', __name__, url_prefix='/adsb')
 
 # Track if using service
 adsb_using_service = False
+# Stop event of the current SBS parser thread; each thread gets its own so a
+# restart can never revive a parser that was asked to stop
+adsb_stop_event = threading.Event()
 adsb_connected = False
 adsb_messages_received = 0
 adsb_last_message_time = None
@@ -72,6 +84,7 @@ adsb_bytes_received = 0
 adsb_lines_received = 0
 adsb_active_device = None  # Track which device index is being used
 _sbs_error_logged = False  # Suppress repeated connection error logs
+_sbs_probe_ok_at = 0.0  # time.monotonic() of the last successful SBS port probe
 
 # Track ICAOs already looked up in aircraft database (avoid repeated lookups)
 _looked_up_icaos: set[str] = set()
@@ -290,11 +303,47 @@ def _record_session_stop(*, stop_source: str | None, stopped_by: str | None) ->
         logger.warning("ADS-B session stop record failed: %s", exc)
         return None
 
+# Static keepalive frame, serialised once
+_SSE_KEEPALIVE = format_sse({'type': 'keepalive'}).encode()
+
+
+def _format_adsb_sse(msg: dict[str, Any]) -> bytes:
+    """Format an ADS-B message as an SSE frame, using orjson when available."""
+    if orjson is not None:
+        try:
+            return b'data: ' + orjson.dumps(msg) + b'\n\n'
+        except TypeError:
+            pass
+    return format_sse(msg).encode()
+
+
+# ADS-B decoder binaries looked up on PATH
+DECODER_BINARIES = ('dump1090', 'dump1090-mutability', 'dump1090-fa', 'readsb', 'rtl_adsb')
+
+
+def _resolve_decoder_binaries() -> dict[str, str | None]:
+    return {name: shutil.which(name) for name in DECODER_BINARIES}
+
+
+# PATH lookups resolved once at import; refreshed via /adsb/tools?refresh=1
+_WHICH_CACHE: dict[str, str | None] = _resolve_decoder_binaries()
+
+
+def refresh_decoder_cache() -> None:
+    """Re-resolve ADS-B decoder binaries on PATH (e.g. after installing one)."""
+    _WHICH_CACHE.update(_resolve_decoder_binaries())
+
+
+def _format_batch_sse(fragments: list[str]) -> bytes:
+    """Wrap pre-serialised aircraft JSON objects in a single batch SSE frame."""
+    return ('data: {"type":"batch","aircraft":[' + ','.join(fragments) + ']}\n\n').encode()
+
+
 def find_dump1090():
     """Find dump1090 binary, checking PATH and common locations."""
     # First try PATH
     for name in ['dump1090', 'dump1090-mutability', 'dump1090-fa']:
-        path = shutil.which(name)
+        path = _WHICH_CACHE.get(name)
         if path:
             return path
     # Check common installation paths directly
@@ -306,21 +355,111 @@ def find_dump1090():
 
 def check_dump1090_service():
     """Check if dump1090 SBS port is available."""
+    global _sbs_probe_ok_at
+    if time.monotonic() - _sbs_probe_ok_at < SBS_PROBE_CACHE_SECONDS:
+        return f'localhost:{ADSB_SBS_PORT}'
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(SOCKET_CONNECT_TIMEOUT)
-        result = sock.connect_ex(('localhost', ADSB_SBS_PORT))
-        sock.close()
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            # Short timeout: localhost answers in microseconds, so a dead port
+            # should not stall the request. The wait uses poll(), which (unlike
+            # select()) works for descriptors numbered above FD_SETSIZE.
+            sock.settimeout(SBS_PROBE_TIMEOUT)
+            result = sock.connect_ex(('localhost', ADSB_SBS_PORT))
         if result == 0:
+            _sbs_probe_ok_at = time.monotonic()
             return f'localhost:{ADSB_SBS_PORT}'
     except OSError:
         pass
     return None
 
 
-def parse_sbs_stream(service_addr):
-    """Parse SBS format data from dump1090 SBS port."""
-    global adsb_using_service, adsb_connected, adsb_messages_received, adsb_last_message_time, adsb_bytes_received, adsb_lines_received, _sbs_error_logged
+def invalidate_sbs_probe() -> None:
+    """Forget the cached SBS probe result (call when dump1090 is being stopped)."""
+    global _sbs_probe_ok_at
+    _sbs_probe_ok_at = 0.0
+
+
+def _configure_sbs_socket(sock: socket.socket) -> None:
+    """Apply latency and buffering tuning to a connected SBS socket."""
+    options = [
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, SBS_SO_RCVBUF),
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    ]
+    for level, option, value in options:
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError as e:
+            logger.debug(f"Could not set SBS socket option {option}: {e}")
+
+
+def _publish_aircraft_updates(adsb_table, service_addr: str) -> None:
+    """Publish snapshots of aircraft updated since the last flush and drop expired ones."""
+    adsb_stream = app_module.adsb_stream
+    now = time.time()
+
+    expired = adsb_table.expire(now)
+    for expired_icao in expired:
+        app_module.adsb_aircraft.delete(expired_icao)
+        _looked_up_icaos.discard(expired_icao)
+        try:
+            process_event('adsb', {'type': 'expire', 'icao': expired_icao}, 'expire')
+        except Exception:
+            pass
+    if expired:
+        # One frame however many aircraft expire, so a mass eviction cannot
+        # flood the broadcast ring
+        adsb_stream.publish(_format_adsb_sse({'type': 'expire', 'icaos': expired}))
+
+    fragments = []
+    rows, masks = adsb_table.take_dirty(now)
+    for row, mask in zip(rows.tolist(), masks.tolist()):
+        update_icao = adsb_table.icao[row]
+        if update_icao is not None:
+            snapshot = adsb_table.snapshot(row)
+            app_module.adsb_aircraft.set(update_icao, snapshot)
+            # SSE clients merge updates by ICAO, so only changed fields are sent
+            # (all fields when the aircraft has not been published recently)
+            fragments.append(adsb_table.to_json(row, mask))
+            try:
+                process_event('adsb', snapshot, 'aircraft')
+            except Exception:
+                pass
+            adsb_snapshot_writer.enqueue({
+                'captured_at': datetime.now(timezone.utc),
+                'icao': update_icao,
+                'callsign': snapshot.get('callsign'),
+                'registration': snapshot.get('registration'),
+                'type_code': snapshot.get('type_code'),
+                'type_desc': snapshot.get('type_desc'),
+                'altitude': snapshot.get('altitude'),
+                'speed': snapshot.get('speed'),
+                'heading': snapshot.get('heading'),
+                'vertical_rate': snapshot.get('vertical_rate'),
+                'lat': snapshot.get('lat'),
+                'lon': snapshot.get('lon'),
+                'squawk': snapshot.get('squawk'),
+                'source_host': service_addr,
+                'snapshot': snapshot,
+            })
+
+    if fragments:
+        # One SSE frame per interval, serialised once and shared by every client
+        adsb_stream.publish(_format_batch_sse(fragments))
+
+
+def _start_sbs_parser(service_addr: str) -> None:
+    """Stop any running SBS parser thread and start a new one for service_addr."""
+    global adsb_using_service, adsb_stop_event
+    adsb_stop_event.set()
+    adsb_stop_event = threading.Event()
+    adsb_using_service = True
+    thread = threading.Thread(target=parse_sbs_stream, args=(service_addr, adsb_stop_event), daemon=True)
+    thread.start()
+
+
+def parse_sbs_stream(service_addr, stop_event):
+    """Parse SBS format data from dump1090 SBS port until stop_event is set."""
+    global adsb_connected, adsb_messages_received, adsb_last_message_time, adsb_bytes_received, adsb_lines_received, _sbs_error_logged
 
     adsb_history_writer.start()
     adsb_snapshot_writer.start()
@@ -328,191 +467,163 @@ def parse_sbs_stream(service_addr):
     host, port = service_addr.split(':')
     port = int(port)
 
+    # The per-line loop below runs tens of thousands of times a second, so
+    # globals and bound methods it uses are looked up once here as locals.
+    adsb_table = app_module.adsb_table
+    row_for = adsb_table.row_for
+    update_row = adsb_table.update
+    looked_up_icaos = _looked_up_icaos
+    history_writer = adsb_history_writer
+    parse_line = parse_sbs_line
+    clock = time.time
+
     logger.info(f"SBS stream parser started, connecting to {host}:{port}")
     adsb_connected = False
     adsb_messages_received = 0
     _sbs_error_logged = False
 
-    while adsb_using_service:
+    while not stop_event.is_set():
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(SBS_SOCKET_TIMEOUT)
-            sock.connect((host, port))
-            adsb_connected = True
-            _sbs_error_logged = False  # Reset so we log next error
-            logger.info("Connected to SBS stream")
-
-            buffer = ""
-            last_update = time.time()
-            pending_updates = set()
-            adsb_bytes_received = 0
-            adsb_lines_received = 0
-
-            while adsb_using_service:
-                try:
-                    data = sock.recv(SOCKET_BUFFER_SIZE).decode('utf-8', errors='ignore')
-                    if not data:
-                        logger.warning("SBS connection closed (no data)")
-                        break
-                    adsb_bytes_received += len(data)
-                    buffer += data
-
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        line = line.strip()
-                        if not line:
-                            continue
-
-                        adsb_lines_received += 1
-                        # Log first few lines for debugging
-                        if adsb_lines_received <= 3:
-                            logger.info(f"SBS line {adsb_lines_received}: {line[:100]}")
-
-                        parts = line.split(',')
-                        if len(parts) < 11 or parts[0] != 'MSG':
-                            if adsb_lines_received <= 5:
-                                logger.debug(f"Skipping non-MSG line: {line[:50]}")
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.settimeout(SBS_SOCKET_TIMEOUT)
+                sock.connect((host, port))
+                _configure_sbs_socket(sock)
+                adsb_connected = True
+                _sbs_error_logged = False  # Reset so we log next error
+                logger.info("Connected to SBS stream")
+
+                # Fixed read buffer: recv_into() appends after any partial line
+                # left over from the previous read, complete lines are parsed in place.
+                buffer = bytearray(SBS_READ_BUFFER_SIZE)
+                view = memoryview(buffer)
+                find_newline = buffer.find
+                write_pos = 0
+                last_update = clock()
+                adsb_bytes_received = 0
+                adsb_lines_received = 0
+                # Counters are kept as locals and published once per read
+                lines_received = 0
+                messages_received = adsb_messages_received
+
+                # Wait for data with a selector instead of a long blocking recv, so
+                # pending updates are still flushed on schedule when traffic pauses
+                # and a stop request is noticed within one update interval.
+                with selectors.DefaultSelector() as selector:
+                    selector.register(sock, selectors.EVENT_READ)
+
+                    while not stop_event.is_set():
+                        if not selector.select(timeout=ADSB_UPDATE_INTERVAL):
+                            if clock() - last_update >= ADSB_UPDATE_INTERVAL:
+                                _publish_aircraft_updates(adsb_table, service_addr)
+                                last_update = clock()
                             continue
 
-                        msg_type = parts[1]
-                        icao = parts[4].upper()
-                        if not icao:
-                            continue
+                        received = sock.recv_into(view[write_pos:])
+                        if not received:
+                            logger.warning("SBS connection closed (no data)")
+                            adsb_connected = False
+                            break
+                        adsb_bytes_received += received
+                        write_pos += received
+                        # One clock read per recv: every line in the chunk arrived together
+                        now = clock()
+
+                        line_start = 0
+                        while True:
+                            line_end = find_newline(b'\n', line_start, write_pos)
+                            if line_end < 0:
+                                break
+                            start, end = line_start, line_end
+                            line_start = line_end + 1
+
+                            # dump1090 terminates lines with \r\n
+                            if end > start and buffer[end - 1] == 0x0D:
+                                end -= 1
+                            if start == end:
+                                continue
+
+                            lines_received += 1
+                            # Log first few lines for debugging
+                            if lines_received <= 3:
+                                logger.info(f"SBS line {lines_received}: {buffer[start:end][:100].decode('utf-8', errors='ignore')}")
+
+                            msg = parse_line(buffer, start, end)
+                            if msg is None:
+                                if lines_received <= 5:
+                                    logger.debug(f"Skipping non-MSG line: {buffer[start:end][:50].decode('utf-8', errors='ignore')}")
+                                continue
+
+                            icao = msg.icao
+
+                            if history_writer.enabled:
+                                line = buffer[start:end].decode('utf-8', errors='ignore').strip()
+                                parts = line.split(',')
+                                msg_time = _parse_sbs_timestamp(_get_part(parts, 6), _get_part(parts, 7))
+                                logged_time = _parse_sbs_timestamp(_get_part(parts, 8), _get_part(parts, 9))
+                                history_record = _build_history_record(
+                                    parts=parts,
+                                    msg_type=parts[1],
+                                    icao=icao,
+                                    msg_time=msg_time,
+                                    logged_time=logged_time,
+                                    service_addr=service_addr,
+                                    raw_line=line,
+                                )
+                                history_writer.enqueue(history_record)
+
+                            row, created = row_for(icao)
+
+                            # Look up aircraft type from database (once per ICAO)
+                            if created or icao not in looked_up_icaos:
+                                looked_up_icaos.add(icao)
+                                db_info = aircraft_db.lookup(icao)
+                                if db_info:
+                                    adsb_table.set_info(row, db_info)
+
+                            update_row(row, msg, now)
+                            messages_received += 1
+
+                        if messages_received != adsb_messages_received:
+                            adsb_last_message_time = now
+                        adsb_lines_received = lines_received
+                        adsb_messages_received = messages_received
 
-                        msg_time = _parse_sbs_timestamp(_get_part(parts, 6), _get_part(parts, 7))
-                        logged_time = _parse_sbs_timestamp(_get_part(parts, 8), _get_part(parts, 9))
-                        history_record = _build_history_record(
-                            parts=parts,
-                            msg_type=msg_type,
-                            icao=icao,
-                            msg_time=msg_time,
-                            logged_time=logged_time,
-                            service_addr=service_addr,
-                            raw_line=line,
-                        )
-                        adsb_history_writer.enqueue(history_record)
-
-                        aircraft = app_module.adsb_aircraft.get(icao) or {'icao': icao}
-
-                        # Look up aircraft type from database (once per ICAO)
-                        if icao not in _looked_up_icaos:
-                            _looked_up_icaos.add(icao)
-                            db_info = aircraft_db.lookup(icao)
-                            if db_info:
-                                if db_info['registration']:
-                                    aircraft['registration'] = db_info['registration']
-                                if db_info['type_code']:
-                                    aircraft['type_code'] = db_info['type_code']
-                                if db_info['type_desc']:
-                                    aircraft['type_desc'] = db_info['type_desc']
-
-                        if msg_type == '1' and len(parts) > 10:
-                            callsign = parts[10].strip()
-                            if callsign:
-                                aircraft['callsign'] = callsign
-
-                        elif msg_type == '3' and len(parts) > 15:
-                            if parts[11]:
-                                try:
-                                    aircraft['altitude'] = int(float(parts[11]))
-                                except (ValueError, TypeError):
-                                    pass
-                            if parts[14] and parts[15]:
-                                try:
-                                    aircraft['lat'] = float(parts[14])
-                                    aircraft['lon'] = float(parts[15])
-                                except (ValueError, TypeError):
-                                    pass
-
-                        elif msg_type == '4' and len(parts) > 16:
-                            if parts[12]:
-                                try:
-                                    aircraft['speed'] = int(float(parts[12]))
-                                except (ValueError, TypeError):
-                                    pass
-                            if parts[13]:
-                                try:
-                                    aircraft['heading'] = int(float(parts[13]))
-                                except (ValueError, TypeError):
-                                    pass
-                            if parts[16]:
-                                try:
-                                    aircraft['vertical_rate'] = int(float(parts[16]))
-                                except (ValueError, TypeError):
-                                    pass
-
-                        elif msg_type == '5' and len(parts) > 11:
-                            if parts[10]:
-                                callsign = parts[10].strip()
-                                if callsign:
-                                    aircraft['callsign'] = callsign
-                            if parts[11]:
-                                try:
-                                    aircraft['altitude'] = int(float(parts[11]))
-                                except (ValueError, TypeError):
-                                    pass
-
-                        elif msg_type == '6' and len(parts) > 17:
-                            if parts[17]:
-                                aircraft['squawk'] = parts[17]
-
-                        app_module.adsb_aircraft.set(icao, aircraft)
-                        pending_updates.add(icao)
-                        adsb_messages_received += 1
-                        adsb_last_message_time = time.time()
-
-                        now = time.time()
                         if now - last_update >= ADSB_UPDATE_INTERVAL:
-                            for update_icao in pending_updates:
-                                if update_icao in app_module.adsb_aircraft:
-                                    snapshot = app_module.adsb_aircraft[update_icao]
-                                    app_module.adsb_queue.put({
-                                        'type': 'aircraft',
-                                        **snapshot
-                                    })
-                                    adsb_snapshot_writer.enqueue({
-                                        'captured_at': datetime.now(timezone.utc),
-                                        'icao': update_icao,
-                                        'callsign': snapshot.get('callsign'),
-                                        'registration': snapshot.get('registration'),
-                                        'type_code': snapshot.get('type_code'),
-                                        'type_desc': snapshot.get('type_desc'),
-                                        'altitude': snapshot.get('altitude'),
-                                        'speed': snapshot.get('speed'),
-                                        'heading': snapshot.get('heading'),
-                                        'vertical_rate': snapshot.get('vertical_rate'),
-                                        'lat': snapshot.get('lat'),
-                                        'lon': snapshot.get('lon'),
-                                        'squawk': snapshot.get('squawk'),
-                                        'source_host': service_addr,
-                                        'snapshot': snapshot,
-                                    })
-                            pending_updates.clear()
+                            _publish_aircraft_updates(adsb_table, service_addr)
                             last_update = now
 
-                except socket.timeout:
-                    continue
-
-            sock.close()
-            adsb_connected = False
+                        # Move the trailing partial line to the front of the buffer
+                        remaining = write_pos - line_start
+                        if remaining >= SBS_READ_BUFFER_SIZE:
+                            logger.warning("SBS line exceeds read buffer, discarding")
+                            remaining = 0
+                        elif line_start and remaining:
+                            buffer[:remaining] = buffer[line_start:write_pos]
+                        write_pos = remaining
         except OSError as e:
             adsb_connected = False
             if not _sbs_error_logged:
                 logger.warning(f"SBS connection error: {e}, reconnecting...")
                 _sbs_error_logged = True
-            time.sleep(SBS_RECONNECT_DELAY)
+            if stop_event.wait(SBS_RECONNECT_DELAY):
+                break
 
-    adsb_connected = False
+    if stop_event is adsb_stop_event:
+        # Leave the status alone if a newer parser has already taken over
+        adsb_connected = False
     logger.info("SBS stream parser stopped")
 
 
 @adsb_bp.route('/tools')
 def check_adsb_tools():
     """Check for ADS-B decoding tools and hardware."""
+    if request.args.get('refresh'):
+        refresh_decoder_cache()
+
     # Check available decoders
     has_dump1090 = find_dump1090() is not None
-    has_readsb = shutil.which('readsb') is not None
-    has_rtl_adsb = shutil.which('rtl_adsb') is not None
+    has_readsb = _WHICH_CACHE.get('readsb') is not None
+    has_rtl_adsb = _WHICH_CACHE.get('rtl_adsb') is not None
 
     # Check what SDR hardware is detected
     devices = SDRFactory.detect_devices()
@@ -552,7 +663,8 @@ def adsb_status():
         'last_message_time': adsb_last_message_time,
         'aircraft_count': len(app_module.adsb_aircraft),
         'aircraft': dict(app_module.adsb_aircraft),  # Full aircraft data
-        'queue_size': app_module.adsb_queue.qsize(),
+        'stream_subscribers': app_module.adsb_stream.subscribers,
+        'stream_frames_published': app_module.adsb_stream.latest(),
         'dump1090_path': find_dump1090(),
         'dump1090_running': dump1090_running,
         'port_30003_open': check_dump1090_service() is not None
@@ -580,7 +692,7 @@ def adsb_session():
 @adsb_bp.route('/start', methods=['POST'])
 def start_adsb():
     """Start ADS-B tracking."""
-    global adsb_using_service, adsb_active_device
+    global adsb_active_device
 
     with app_module.adsb_lock:
         if adsb_using_service:
@@ -616,9 +728,7 @@ def start_adsb():
 
         remote_addr = f"{remote_sbs_host}:{remote_sbs_port}"
         logger.info(f"Connecting to remote dump1090 SBS at {remote_addr}")
-        adsb_using_service = True
-        thread = threading.Thread(target=parse_sbs_stream, args=(remote_addr,), daemon=True)
-        thread.start()
+        _start_sbs_parser(remote_addr)
         session = _record_session_start(
             device_index=device,
             sdr_type='remote',
@@ -637,9 +747,7 @@ def start_adsb():
     existing_service = check_dump1090_service()
     if existing_service:
         logger.info(f"Found existing dump1090 service at {existing_service}")
-        adsb_using_service = True
-        thread = threading.Thread(target=parse_sbs_stream, args=(existing_service,), daemon=True)
-        thread.start()
+        _start_sbs_parser(existing_service)
         session = _record_session_start(
             device_index=device,
             sdr_type='external',
@@ -664,11 +772,18 @@ def start_adsb():
     # For RTL-SDR, use dump1090. For other hardware, need readsb with SoapySDR
     if sdr_type == SDRType.RTL_SDR:
         dump1090_path = find_dump1090()
+        if not dump1090_path:
+            # May have been installed since the cache was filled
+            refresh_decoder_cache()
+            dump1090_path = find_dump1090()
         if not dump1090_path:
             return jsonify({'status': 'error', 'message': 'dump1090 not found. Install dump1090/dump1090-fa or ensure it is in /usr/local/bin/'})
     else:
         # For LimeSDR/HackRF, check for readsb (dump1090 with SoapySDR support)
-        dump1090_path = shutil.which('readsb') or find_dump1090()
+        dump1090_path = _WHICH_CACHE.get('readsb') or find_dump1090()
+        if not dump1090_path:
+            refresh_decoder_cache()
+            dump1090_path = _WHICH_CACHE.get('readsb') or find_dump1090()
         if not dump1090_path:
             return jsonify({'status': 'error', 'message': f'readsb or dump1090 not found for {sdr_type.value}. Install readsb with SoapySDR support.'})
 
@@ -771,10 +886,8 @@ def start_adsb():
                 'message': full_msg
             })
 
-        adsb_using_service = True
         adsb_active_device = device  # Track which device is being used
-        thread = threading.Thread(target=parse_sbs_stream, args=(f'localhost:{ADSB_SBS_PORT}',), daemon=True)
-        thread.start()
+        _start_sbs_parser(f'localhost:{ADSB_SBS_PORT}')
 
         session = _record_session_start(
             device_index=device,
@@ -819,6 +932,7 @@ def stop_adsb():
                 except (ProcessLookupError, OSError):
                     pass
             app_module.adsb_process = None
+            invalidate_sbs_probe()  # Port is going away with the process
             logger.info("ADS-B process stopped")
 
         # Release device from registry
@@ -826,9 +940,11 @@ def stop_adsb():
             app_module.release_sdr_device(adsb_active_device)
 
         adsb_using_service = False
+        adsb_stop_event.set()
         adsb_active_device = None
 
     app_module.adsb_aircraft.clear()
+    app_module.adsb_table.clear()
     _looked_up_icaos.clear()
     session = _record_session_stop(stop_source=stop_source, stopped_by=stopped_by)
     return jsonify({'status': 'stopped', 'session': session})
@@ -838,22 +954,32 @@ def stop_adsb():
 def stream_adsb():
     """SSE stream for ADS-B aircraft."""
     def generate():
+        adsb_stream = app_module.adsb_stream
         last_keepalive = time.time()
-
-        while True:
-            try:
-                msg = app_module.adsb_queue.get(timeout=SSE_QUEUE_TIMEOUT)
-                last_keepalive = time.time()
-                try:
-                    process_event('adsb', msg, msg.get('type'))
-                except Exception:
-                    pass
-                yield format_sse(msg)
-            except queue.Empty:
-                now = time.time()
-                if now - last_keepalive >= SSE_KEEPALIVE_INTERVAL:
-                    yield format_sse({'type': 'keepalive'})
-                    last_keepalive = now
+        # Only frames published after the client connects are sent
+        seq = adsb_stream.subscribe()
+        try:
+            # Batches carry only changed fields, so start new clients from the full state
+            aircraft = app_module.adsb_aircraft.values()
+            if aircraft:
+                yield _format_adsb_sse({'type': 'batch', 'aircraft': aircraft})
+
+            while True:
+                seq, frames, missed = adsb_stream.read(seq, timeout=SSE_QUEUE_TIMEOUT)
+                if missed:
+                    # Deltas were overwritten before this client read them; the
+                    # full state goes last so it supersedes the older frames
+                    frames.append(_format_adsb_sse({'type': 'batch', 'aircraft': app_module.adsb_aircraft.values()}))
+                if frames:
+                    last_keepalive = time.time()
+                    yield b''.join(frames)
+                else:
+                    now = time.time()
+                    if now - last_keepalive >= SSE_KEEPALIVE_INTERVAL:
+                        yield _SSE_KEEPALIVE
+                        last_keepalive = now
+        finally:
+            adsb_stream.unsubscribe()
 
     response = Response(generate(), mimetype='text/event-stream')
     response.headers['Cache-Control'] = 'no-cache'
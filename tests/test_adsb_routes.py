@@ -0,0 +1,401 @@
+"""Tests for ADS-B route helpers."""
+
+import json
+import os
+import resource
+import socket
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import app as app_module
+from routes import adsb
+from utils.adsb_table import AircraftTable
+from utils.cleanup import DataStore
+from utils.sbs_parse import SBSMessage, parse_sbs_line
+
+
+@pytest.fixture
+def auth_client(client):
+    """Client with logged-in session."""
+    with client.session_transaction() as sess:
+        sess['logged_in'] = True
+    return client
+
+
+@pytest.fixture
+def listening_port():
+    """A localhost TCP port accepting connections."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def closed_port():
+    """A localhost TCP port nothing is listening on."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def _decode_frame(frame: bytes) -> dict:
+    """Decode a single SSE data frame."""
+    assert frame.startswith(b'data: ') and frame.endswith(b'\n\n')
+    return json.loads(frame[len(b'data: '):-2])
+
+
+@pytest.fixture
+def adsb_state():
+    """Fresh aircraft table, store and stubbed SSE stream for the publish path."""
+    table = AircraftTable(capacity=2, max_age_seconds=60)
+    stream = MagicMock()
+    with patch.object(app_module, 'adsb_table', table), \
+            patch.object(app_module, 'adsb_aircraft', DataStore(name='test_adsb')), \
+            patch.object(app_module, 'adsb_stream', stream), \
+            patch.object(adsb, 'adsb_snapshot_writer') as snapshot_writer, \
+            patch.object(adsb, 'process_event'), \
+            patch.object(adsb, '_looked_up_icaos', set()):
+        yield table, stream, snapshot_writer
+
+
+def _published(stream) -> list[dict]:
+    return [_decode_frame(call.args[0]) for call in stream.publish.call_args_list]
+
+
+class TestPublishAircraftUpdates:
+    """Tests for the periodic ADS-B flush."""
+
+    def test_updates_published_as_one_batch(self, adsb_state):
+        """Test updated aircraft are stored and sent in a single batch frame."""
+        table, stream, snapshot_writer = adsb_state
+        now = time.time()
+        row_a, _ = table.row_for('4CA2D6')
+        table.update(row_a, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=35000), now)
+        row_b, _ = table.row_for('ABCDEF')
+        table.update(row_b, SBSMessage(6, 'ABCDEF', squawk='7700'), now)
+
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+
+        assert _published(stream) == [{
+            'type': 'batch',
+            'aircraft': [
+                {'icao': '4CA2D6', 'callsign': 'RYR1234', 'altitude': 35000},
+                {'icao': 'ABCDEF', 'squawk': '7700'},
+            ],
+        }]
+        assert app_module.adsb_aircraft.get('4CA2D6') == {
+            'icao': '4CA2D6', 'callsign': 'RYR1234', 'altitude': 35000,
+        }
+        assert app_module.adsb_aircraft.get('ABCDEF') == {'icao': 'ABCDEF', 'squawk': '7700'}
+        assert snapshot_writer.enqueue.call_count == 2
+
+    def test_aircraft_returning_after_gap_sends_all_fields(self, adsb_state):
+        """Test an aircraft silent for longer than the client timeout is resent in full."""
+        table, stream, _ = adsb_state
+        row, _ = table.row_for('4CA2D6')
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=35000), time.time())
+        table.update(row, SBSMessage(6, '4CA2D6', squawk='7700'), time.time())
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+
+        # Still fresh: only the changed field is sent
+        stream.reset_mock()
+        table.update(row, SBSMessage(3, '4CA2D6', altitude=35100), time.time())
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+        assert _published(stream)[0]['aircraft'] == [{'icao': '4CA2D6', 'altitude': 35100}]
+
+        # Quiet for 90 s (dashboard dropped it after its timeout): everything is resent
+        stream.reset_mock()
+        table.last_published[row] -= 90
+        table.update(row, SBSMessage(3, '4CA2D6', altitude=35200), time.time())
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+        assert _published(stream)[0]['aircraft'] == [
+            {'icao': '4CA2D6', 'callsign': 'RYR1234', 'altitude': 35200, 'squawk': '7700'},
+        ]
+
+    def test_expiries_share_one_frame(self, adsb_state):
+        """Test all aircraft expiring in one flush are announced in a single frame."""
+        table, stream, _ = adsb_state
+        for icao in ('AAAAAA', 'BBBBBB'):
+            row, _ = table.row_for(icao)
+            table.update(row, SBSMessage(8, icao), time.time() - 120)
+        table.take_dirty()
+
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+
+        assert _published(stream) == [{'type': 'expire', 'icaos': ['AAAAAA', 'BBBBBB']}]
+
+    def test_oversized_values_do_not_break_flush(self, adsb_state):
+        """Test an absurd numeric field is dropped rather than crashing the flush."""
+        table, stream, _ = adsb_state
+        msg = parse_sbs_line(b'MSG,4,1,1,ABC124,1,,,,,,,' + b'9' * 41 + b',90,,,,,0,0,0,0')
+        row, _ = table.row_for(msg.icao)
+        table.update(row, msg, time.time())
+
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+
+        assert _published(stream) == [{'type': 'batch', 'aircraft': [{'icao': 'ABC124', 'heading': 90}]}]
+
+    def test_nothing_published_without_updates(self, adsb_state):
+        """Test an idle flush publishes no frames."""
+        table, stream, _ = adsb_state
+        table.row_for('4CA2D6')
+
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+
+        stream.publish.assert_not_called()
+
+    def test_expired_aircraft_removed(self, adsb_state):
+        """Test aircraft past max_age are deleted and announced with an expire frame."""
+        table, stream, _ = adsb_state
+        row, _ = table.row_for('4CA2D6')
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234'), time.time() - 120)
+        app_module.adsb_aircraft.set('4CA2D6', {'icao': '4CA2D6'})
+        adsb._looked_up_icaos.add('4CA2D6')
+        table.take_dirty()
+
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+
+        assert _published(stream) == [{'type': 'expire', 'icaos': ['4CA2D6']}]
+        assert '4CA2D6' not in app_module.adsb_aircraft
+        assert '4CA2D6' not in adsb._looked_up_icaos
+
+    def test_evicted_aircraft_expired_before_batch(self, adsb_state):
+        """Test an aircraft evicted from a full table is expired ahead of the new batch."""
+        table, stream, _ = adsb_state
+        now = time.time()
+        for icao, seen in (('AAAAAA', now - 10), ('BBBBBB', now)):
+            row, _ = table.row_for(icao)
+            table.update(row, SBSMessage(8, icao), seen)
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+        stream.reset_mock()
+
+        row, _ = table.row_for('CCCCCC')
+        table.update(row, SBSMessage(8, 'CCCCCC'), now)
+        adsb._publish_aircraft_updates(table, 'localhost:30003')
+
+        assert _published(stream) == [
+            {'type': 'expire', 'icaos': ['AAAAAA']},
+            {'type': 'batch', 'aircraft': [{'icao': 'CCCCCC'}]},
+        ]
+        assert sorted(app_module.adsb_aircraft.keys()) == ['BBBBBB', 'CCCCCC']
+
+
+class TestParseSbsStream:
+    """Tests for the SBS socket reader against a local server."""
+
+    @pytest.fixture
+    def sbs_server(self):
+        """Local SBS server; the test supplies the chunks it sends."""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        done = threading.Event()
+        chunks: list[bytes] = []
+
+        def serve():
+            conn, _ = server.accept()
+            with conn:
+                for chunk in chunks:
+                    conn.sendall(chunk)
+                    time.sleep(0.05)  # Separate reads on the parser side
+                done.wait(10)  # Hold the connection open with no traffic
+
+        thread = threading.Thread(target=serve, daemon=True)
+        yield server.getsockname()[1], chunks, thread
+        done.set()
+        thread.join(2)
+        server.close()
+
+    def test_reads_split_lines_and_flushes_when_idle(self, adsb_state, sbs_server):
+        """Test partial, CRLF-terminated and overlong lines, the idle flush and stopping."""
+        _, stream, _ = adsb_state
+        port, chunks, server_thread = sbs_server
+        chunks.extend([
+            # A line split across two reads
+            b'MSG,1,1,1,4CA2D6,1,,,,,RYR1234 ,,,,,,,,,,,0\r\nMSG,3,1,1,4CA2D6,1,,,,,,35000,,,51.4',
+            b'7000,-0.45430,,,0,0,0,0\r\n',
+            # Longer than the read buffer: discarded, then the remainder is skipped as a non-MSG line
+            b'X' * 300,
+            b'\r\nMSG,6,1,1,4CA2D6,1,,,,,,,,,,,,7700,0,0,0,0\r\n',
+        ])
+        server_thread.start()
+
+        stop_event = threading.Event()
+        with patch.object(adsb, 'ADSB_UPDATE_INTERVAL', 0.5), \
+                patch.object(adsb, 'SBS_READ_BUFFER_SIZE', 256), \
+                patch.object(adsb, 'adsb_history_writer', MagicMock(enabled=False)), \
+                patch.object(adsb, 'adsb_stop_event', stop_event), \
+                patch.object(adsb.aircraft_db, 'lookup', return_value=None):
+            parser = threading.Thread(target=adsb.parse_sbs_stream, args=(f'127.0.0.1:{port}', stop_event), daemon=True)
+            parser.start()
+            try:
+                # Everything is sent within ~0.2 s, so the batch comes from the idle flush
+                deadline = time.time() + 5
+                while not stream.publish.called and time.time() < deadline:
+                    time.sleep(0.05)
+            finally:
+                stop_event.set()
+                parser.join(3)
+
+        assert not parser.is_alive()
+        assert adsb.adsb_connected is False
+        assert adsb.adsb_lines_received == 4
+        assert adsb.adsb_messages_received == 3
+        expected = {
+            'icao': '4CA2D6', 'callsign': 'RYR1234', 'altitude': 35000,
+            'lat': 51.47, 'lon': -0.4543, 'squawk': '7700',
+        }
+        assert app_module.adsb_aircraft.get('4CA2D6') == expected
+        assert _published(stream)[0] == {'type': 'batch', 'aircraft': [expected]}
+
+    def test_restart_does_not_revive_stopped_parser(self):
+        """Test a stop followed by a quick start leaves the old parser thread stopped."""
+        started = []
+
+        def fake_parser(service_addr, stop_event):
+            started.append((threading.current_thread(), stop_event))
+            stop_event.wait(5)
+
+        with patch.object(adsb, 'parse_sbs_stream', side_effect=fake_parser), \
+                patch.object(adsb, 'adsb_stop_event', threading.Event()), \
+                patch.object(adsb, 'adsb_using_service', False):
+            adsb._start_sbs_parser('localhost:30003')
+            adsb.adsb_stop_event.set()  # /stop
+            adsb._start_sbs_parser('localhost:30003')
+            deadline = time.time() + 2
+            while len(started) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+
+            (old_thread, old_event), (new_thread, new_event) = started
+            old_thread.join(2)
+            assert not old_thread.is_alive()
+            assert old_event.is_set()
+            assert not new_event.is_set()
+            assert adsb.adsb_stop_event is new_event
+            assert new_thread.is_alive()
+            new_event.set()
+            new_thread.join(2)
+
+
+class TestStreamAdsb:
+    """Tests for the ADS-B SSE stream."""
+
+    def test_new_client_gets_full_state(self, app, adsb_state):
+        """Test a new client first receives every aircraft with all fields."""
+        _, stream, _ = adsb_state
+        stream.subscribe.return_value = 0
+        stream.read.return_value = (0, [], False)
+        aircraft = {'icao': '4CA2D6', 'callsign': 'RYR1234', 'altitude': 35000, 'squawk': '7700'}
+        app_module.adsb_aircraft.set('4CA2D6', aircraft)
+
+        with app.test_request_context('/adsb/stream'):
+            frames = iter(adsb.stream_adsb().response)
+            first = next(frames)
+            frames.close()
+
+        assert _decode_frame(first) == {'type': 'batch', 'aircraft': [aircraft]}
+        stream.unsubscribe.assert_called_once()
+
+    def test_lagging_client_gets_full_state_after_buffered_frames(self, app, adsb_state):
+        """Test a client that missed overwritten frames is resent the full state."""
+        _, stream, _ = adsb_state
+        stream.subscribe.return_value = 0
+        delta = adsb._format_batch_sse(['{"icao":"4CA2D6","altitude":35100}'])
+        aircraft = {'icao': '4CA2D6', 'callsign': 'RYR1234', 'altitude': 35200}
+
+        def read(seq, timeout):
+            # The aircraft appears after the client connected, so there is no initial state frame
+            app_module.adsb_aircraft.set('4CA2D6', aircraft)
+            return 70, [delta], True
+
+        stream.read.side_effect = read
+
+        with app.test_request_context('/adsb/stream'):
+            frames = iter(adsb.stream_adsb().response)
+            chunk = next(frames)
+            frames.close()
+
+        assert chunk.startswith(delta)
+        assert _decode_frame(chunk[len(delta):]) == {'type': 'batch', 'aircraft': [aircraft]}
+
+
+class TestSbsProbe:
+    """Tests for check_dump1090_service and its success cache."""
+
+    @pytest.fixture(autouse=True)
+    def reset_probe_cache(self):
+        """Start and finish every test without a cached probe result."""
+        adsb.invalidate_sbs_probe()
+        yield
+        adsb.invalidate_sbs_probe()
+
+    def test_listening_port(self, listening_port):
+        """Test a listening SBS port is reported as available."""
+        port = listening_port.getsockname()[1]
+        with patch.object(adsb, 'ADSB_SBS_PORT', port):
+            assert adsb.check_dump1090_service() == f'localhost:{port}'
+
+    def test_closed_port(self, closed_port):
+        """Test a closed SBS port is reported as unavailable."""
+        with patch.object(adsb, 'ADSB_SBS_PORT', closed_port):
+            assert adsb.check_dump1090_service() is None
+
+    def test_descriptor_above_fd_setsize(self, listening_port):
+        """Test the probe works when its socket gets a descriptor number above 1024."""
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard != resource.RLIM_INFINITY and hard < 1200:
+            pytest.skip('open file limit too low')
+        resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, 1200), hard))
+        held = []
+        try:
+            while not held or held[-1] < 1100:
+                held.append(os.open(os.devnull, os.O_RDONLY))
+            port = listening_port.getsockname()[1]
+            with patch.object(adsb, 'ADSB_SBS_PORT', port):
+                assert adsb.check_dump1090_service() == f'localhost:{port}'
+        finally:
+            for fd in held:
+                os.close(fd)
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+    def test_failure_is_not_cached(self, closed_port):
+        """Test a failed probe is retried on the next call."""
+        with patch.object(adsb, 'ADSB_SBS_PORT', closed_port):
+            assert adsb.check_dump1090_service() is None
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                server.bind(('127.0.0.1', closed_port))
+                server.listen(1)
+                assert adsb.check_dump1090_service() == f'localhost:{closed_port}'
+            finally:
+                server.close()
+
+    def test_success_is_cached_until_invalidated(self, listening_port):
+        """Test a successful probe is reused until the cache is invalidated."""
+        port = listening_port.getsockname()[1]
+        with patch.object(adsb, 'ADSB_SBS_PORT', port):
+            assert adsb.check_dump1090_service() == f'localhost:{port}'
+            listening_port.close()
+
+            assert adsb.check_dump1090_service() == f'localhost:{port}'
+            adsb.invalidate_sbs_probe()
+            assert adsb.check_dump1090_service() is None
+
+    def test_kill_all_invalidates_cache(self, auth_client, listening_port):
+        """Test kill-all forgets a cached probe so /adsb/start re-checks the port."""
+        port = listening_port.getsockname()[1]
+        with patch.object(adsb, 'ADSB_SBS_PORT', port):
+            assert adsb.check_dump1090_service() == f'localhost:{port}'
+            listening_port.close()
+
+            with patch('subprocess.run'):
+                assert auth_client.post('/killall').status_code == 200
+            assert adsb.check_dump1090_service() is None
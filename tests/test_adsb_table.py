@@ -0,0 +1,206 @@
+"""Tests for the ADS-B aircraft state table."""
+
+import json
+import time
+
+from utils.adsb_table import ALL_FIELDS, FIELD_BITS, SEEN, AircraftTable
+from utils.sbs_parse import SBSMessage
+
+
+class TestAircraftTable:
+    """Tests for AircraftTable."""
+
+    def test_row_allocation(self):
+        """Test rows are allocated once per ICAO."""
+        table = AircraftTable(capacity=4)
+
+        row, created = table.row_for('4CA2D6')
+        assert created is True
+        assert table.row_for('4CA2D6') == (row, False)
+        assert '4CA2D6' in table
+        assert len(table) == 1
+
+    def test_snapshot_merges_messages(self):
+        """Test snapshots combine fields from several message types."""
+        table = AircraftTable(capacity=4)
+        row, _ = table.row_for('4CA2D6')
+        now = time.time()
+
+        table.set_info(row, {'registration': 'EI-DLJ', 'type_code': 'B738', 'type_desc': None})
+        table.update(row, SBSMessage(1, '4CA2D6', callsign='RYR1234'), now)
+        table.update(row, SBSMessage(3, '4CA2D6', altitude=35000, lat=51.47, lon=-0.4543), now)
+        table.update(row, SBSMessage(4, '4CA2D6', speed=450, heading=270, vertical_rate=-640), now)
+
+        assert table.snapshot(row) == {
+            'icao': '4CA2D6',
+            'registration': 'EI-DLJ',
+            'type_code': 'B738',
+            'callsign': 'RYR1234',
+            'altitude': 35000,
+            'lat': 51.47,
+            'lon': -0.4543,
+            'speed': 450,
+            'heading': 270,
+            'vertical_rate': -640,
+        }
+
+    def test_snapshot_omits_missing_fields(self):
+        """Test fields never received are left out of the snapshot."""
+        table = AircraftTable(capacity=4)
+        row, _ = table.row_for('ABCDEF')
+        table.update(row, SBSMessage(6, 'ABCDEF', squawk='7700'), time.time())
+
+        assert table.snapshot(row) == {'icao': 'ABCDEF', 'squawk': '7700'}
+
+    def test_to_json_matches_snapshot(self):
+        """Test the f-string serialiser produces the snapshot as JSON."""
+        table = AircraftTable(capacity=4)
+        row, _ = table.row_for('4CA2D6')
+        now = time.time()
+
+        table.set_info(row, {'registration': 'EI-DLJ', 'type_code': 'B738', 'type_desc': ['BOEING 737-800', 'L2J', 'M']})
+        table.update(row, SBSMessage(1, '4CA2D6', callsign='RYR 12"'), now)
+        table.update(row, SBSMessage(3, '4CA2D6', altitude=35000, lat=51.4700012, lon=-0.4543), now)
+        table.update(row, SBSMessage(6, '4CA2D6', squawk='7700'), now)
+
+        decoded = json.loads(table.to_json(row))
+        assert decoded == {**table.snapshot(row), 'lat': 51.47}
+        assert list(decoded) == list(table.snapshot(row))
+
+    def test_to_json_minimal(self):
+        """Test a row with no data serialises to just the ICAO."""
+        table = AircraftTable(capacity=4)
+        row, _ = table.row_for('ABCDEF')
+
+        assert table.to_json(row) == '{"icao":"ABCDEF"}'
+
+    def test_take_dirty(self):
+        """Test updated rows are reported once per flush."""
+        table = AircraftTable(capacity=4)
+        row_a, _ = table.row_for('AAAAAA')
+        row_b, _ = table.row_for('BBBBBB')
+        table.update(row_b, SBSMessage(8, 'BBBBBB'), time.time())
+
+        rows, masks = table.take_dirty()
+        assert list(rows) == [row_b]
+        assert list(masks) == [ALL_FIELDS]  # First publish sends everything
+        assert list(table.take_dirty()[0]) == []
+
+        table.update(row_a, SBSMessage(8, 'AAAAAA'), time.time())
+        table.update(row_b, SBSMessage(8, 'BBBBBB'), time.time())
+        rows, masks = table.take_dirty()
+        assert sorted(rows) == sorted([row_a, row_b])
+        assert masks[list(rows).index(row_b)] == SEEN
+
+    def test_change_mask_tracks_changed_values(self):
+        """Test only fields whose values changed are marked in the mask."""
+        table = AircraftTable(capacity=4)
+        row, _ = table.row_for('4CA2D6')
+        now = time.time()
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=35000), now)
+        table.take_dirty()
+
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=35100), now)
+        table.update(row, SBSMessage(3, '4CA2D6', altitude=35100, lat=51.47, lon=-0.4543), now)
+        _, masks = table.take_dirty()
+
+        assert masks[0] == SEEN | FIELD_BITS['altitude'] | FIELD_BITS['lat'] | FIELD_BITS['lon']
+
+    def test_to_json_changed_fields_only(self):
+        """Test a change mask limits the serialised fields."""
+        table = AircraftTable(capacity=4)
+        row, _ = table.row_for('4CA2D6')
+        now = time.time()
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=35000), now)
+        table.take_dirty()
+
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=34000), now)
+        _, masks = table.take_dirty()
+
+        assert table.to_json(row, int(masks[0])) == '{"icao":"4CA2D6","altitude":34000}'
+        assert table.to_json(row, SEEN) == '{"icao":"4CA2D6"}'
+
+    def test_full_state_after_publish_gap(self):
+        """Test an aircraft returning after a gap is reported with all fields."""
+        table = AircraftTable(capacity=4, full_update_seconds=30)
+        row, _ = table.row_for('4CA2D6')
+        start = time.time()
+        table.set_info(row, {'registration': 'EI-DLJ'})
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=35000), start)
+        table.take_dirty(start)
+
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=35100), start + 10)
+        _, masks = table.take_dirty(start + 10)
+        assert table.to_json(row, int(masks[0])) == '{"icao":"4CA2D6","altitude":35100}'
+
+        table.update(row, SBSMessage(5, '4CA2D6', callsign='RYR1234', altitude=35200), start + 100)
+        _, masks = table.take_dirty(start + 100)
+        assert masks[0] == ALL_FIELDS
+        assert json.loads(table.to_json(row, int(masks[0]))) == {
+            'icao': '4CA2D6', 'registration': 'EI-DLJ', 'callsign': 'RYR1234', 'altitude': 35200,
+        }
+
+    def test_remove_frees_row(self):
+        """Test removed rows are reused without leftover state."""
+        table = AircraftTable(capacity=1)
+        row, _ = table.row_for('AAAAAA')
+        table.update(row, SBSMessage(5, 'AAAAAA', callsign='OLD', altitude=1000), time.time())
+
+        assert table.remove('AAAAAA') is True
+        assert table.remove('AAAAAA') is False
+
+        new_row, created = table.row_for('BBBBBB')
+        assert created is True
+        assert table.snapshot(new_row) == {'icao': 'BBBBBB'}
+
+    def test_full_table_reclaims_stale_rows(self):
+        """Test a full table frees rows older than max_age."""
+        table = AircraftTable(capacity=1, max_age_seconds=60)
+        row, _ = table.row_for('AAAAAA')
+        table.update(row, SBSMessage(8, 'AAAAAA'), time.time() - 120)
+
+        new_row, created = table.row_for('BBBBBB')
+        assert created is True
+        assert new_row == row
+        assert 'AAAAAA' not in table
+        assert table.expire(time.time()) == ['AAAAAA']
+
+    def test_full_table_evicts_least_recently_seen(self):
+        """Test a full table of fresh rows evicts the oldest aircraft."""
+        table = AircraftTable(capacity=2, max_age_seconds=60)
+        now = time.time()
+        row_a, _ = table.row_for('AAAAAA')
+        table.update(row_a, SBSMessage(8, 'AAAAAA'), now - 10)
+        row_b, _ = table.row_for('BBBBBB')
+        table.update(row_b, SBSMessage(8, 'BBBBBB'), now)
+
+        row_c, created = table.row_for('CCCCCC')
+        assert created is True
+        assert row_c == row_a
+        assert 'AAAAAA' not in table
+        assert 'BBBBBB' in table
+        assert table.expire(now) == ['AAAAAA']
+        assert table.expire(now) == []
+
+    def test_expire(self):
+        """Test aircraft not updated within max_age are expired."""
+        table = AircraftTable(capacity=4, max_age_seconds=60)
+        now = time.time()
+        row_a, _ = table.row_for('AAAAAA')
+        table.update(row_a, SBSMessage(8, 'AAAAAA'), now - 61)
+        row_b, _ = table.row_for('BBBBBB')
+        table.update(row_b, SBSMessage(8, 'BBBBBB'), now - 30)
+
+        assert table.expire(now) == ['AAAAAA']
+        assert 'AAAAAA' not in table
+        assert 'BBBBBB' in table
+
+    def test_clear(self):
+        """Test clear removes all aircraft."""
+        table = AircraftTable(capacity=2)
+        table.row_for('AAAAAA')
+        table.row_for('BBBBBB')
+        table.clear()
+
+        assert len(table) == 0
+        assert table.row_for('CCCCCC')[1] is True
@@ -0,0 +1,137 @@
+"""Tests for the SBS (BaseStation) line parser."""
+
+import pytest
+
+from utils.sbs_parse import SBSMessage, parse_sbs_line
+
+
+class TestParseSbsLine:
+    """Tests for parse_sbs_line."""
+
+    def test_identification_message(self):
+        """Test MSG,1 extracts the callsign."""
+        line = b'MSG,1,1,1,4CA2D6,1,2024/01/01,12:00:00.000,2024/01/01,12:00:00.000,RYR1234 ,,,,,,,,,,,0'
+        msg = parse_sbs_line(line)
+
+        assert msg == SBSMessage(1, '4CA2D6', callsign='RYR1234')
+
+    def test_airborne_position_message(self):
+        """Test MSG,3 extracts altitude and position."""
+        line = b'MSG,3,1,1,4ca2d6,1,2024/01/01,12:00:00.000,2024/01/01,12:00:00.000,,35000,,,51.47000,-0.45430,,,0,0,0,0'
+        msg = parse_sbs_line(line)
+
+        assert msg.msg_type == 3
+        assert msg.icao == '4CA2D6'
+        assert msg.altitude == 35000
+        assert msg.lat == pytest.approx(51.47)
+        assert msg.lon == pytest.approx(-0.4543)
+
+    def test_position_requires_both_coordinates(self):
+        """Test MSG,3 drops a position missing one coordinate."""
+        line = b'MSG,3,1,1,4CA2D6,1,,,,,,35000,,,51.47000,,,,0,0,0,0'
+        msg = parse_sbs_line(line)
+
+        assert msg.altitude == 35000
+        assert msg.lat is None
+        assert msg.lon is None
+
+    def test_airborne_velocity_message(self):
+        """Test MSG,4 extracts speed, heading and vertical rate."""
+        line = b'MSG,4,1,1,4CA2D6,1,,,,,,,450.5,270,,,-640,,0,0,0,0'
+        msg = parse_sbs_line(line)
+
+        assert msg.speed == 450
+        assert msg.heading == 270
+        assert msg.vertical_rate == -640
+
+    def test_surveillance_squawk_message(self):
+        """Test MSG,6 extracts the squawk."""
+        line = b'MSG,6,1,1,4CA2D6,1,,,,,,,,,,,,7700,0,0,0,0'
+        msg = parse_sbs_line(line)
+
+        assert msg.squawk == '7700'
+
+    @pytest.mark.parametrize('raw, expected', [
+        (b'4CA2D6', '4CA2D6'),
+        (b'123456', '123456'),
+        (b'4ca2d6', '4CA2D6'),
+        (b' 4Ca2D6 ', '4CA2D6'),
+        (b'~4ca2d6', '~4CA2D6'),
+    ])
+    def test_icao_normalised(self, raw, expected):
+        """Test ICAO addresses are returned stripped and upper-case."""
+        line = b'MSG,8,1,1,' + raw + b',1,,,,,,,,,,,,,,,,0'
+        assert parse_sbs_line(line).icao == expected
+
+    def test_slice_of_buffer(self):
+        """Test parsing a line held inside a larger buffer."""
+        buf = b'garbage\nMSG,5,1,1,ABCDEF,1,,,,,EZY12,12000,,,,,,,0,0,0,0\nMSG,8'
+        start = buf.index(b'MSG')
+        end = buf.index(b'\n', start)
+        msg = parse_sbs_line(buf, start, end)
+
+        assert msg == SBSMessage(5, 'ABCDEF', callsign='EZY12', altitude=12000)
+
+    def test_bytearray_buffer(self):
+        """Test parsing from the bytearray used as the socket receive buffer."""
+        buf = bytearray(b'MSG,3,1,1,4CA2D6,1,,,,,,35000,,,51.47000,-0.45430,,,0,0,0,0')
+        msg = parse_sbs_line(buf)
+
+        assert msg.msg_type == 3
+        assert msg.icao == '4CA2D6'
+        assert msg.altitude == 35000
+
+    def test_invalid_numbers_are_ignored(self):
+        """Test malformed numeric fields become None."""
+        line = b'MSG,4,1,1,4CA2D6,1,,,,,,,fast,north,,,up,,0,0,0,0'
+        msg = parse_sbs_line(line)
+
+        assert msg.speed is None
+        assert msg.heading is None
+        assert msg.vertical_rate is None
+
+    @pytest.mark.parametrize('field', [b'inf', b'-inf', b'nan', b'1e400'])
+    def test_non_finite_integers_are_ignored(self, field):
+        """Test inf/nan/overflowing numeric fields become None instead of raising."""
+        line = b'MSG,4,1,1,4CA2D6,1,,,,,,,' + field + b',270,,,' + field + b',,0,0,0,0'
+        msg = parse_sbs_line(line)
+
+        assert msg.speed is None
+        assert msg.heading == 270
+        assert msg.vertical_rate is None
+
+    @pytest.mark.parametrize('field', [b'9' * 41, b'-16777217', b'3.5e38'])
+    def test_out_of_range_integers_are_ignored(self, field):
+        """Test integers too large for the table's float32 columns become None."""
+        line = b'MSG,4,1,1,ABC124,1,,,,,,,' + field + b',90,,,-16777216,,0,0,0,0'
+        msg = parse_sbs_line(line)
+
+        assert msg.speed is None
+        assert msg.heading == 90
+        assert msg.vertical_rate == -16777216
+
+    @pytest.mark.parametrize('field', [b'inf', b'-inf', b'nan', b'1e400'])
+    def test_non_finite_coordinates_are_ignored(self, field):
+        """Test non-finite coordinates drop the position."""
+        line = b'MSG,3,1,1,4CA2D6,1,,,,,,35000,,,' + field + b',-0.45430,,,0,0,0,0'
+        msg = parse_sbs_line(line)
+
+        assert msg.altitude == 35000
+        assert msg.lat is None
+        assert msg.lon is None
+
+    @pytest.mark.parametrize('line', [
+        b'',
+        b'STA,,1,1,4CA2D6,1,,,,,RM',
+        b'MSGS,3,1,1,4CA2D6,1,,,,,,35000,,,,,,,0,0,0,0',
+        b'MSG,3,1,1',
+        b'MSG,3,1,1,,1,,,,,,35000,,,,,,,0,0,0,0',
+        b'MSG,x,1,1,4CA2D6,1,,,,,,',
+        b'MSG,3,1,1,ab"c,1,,,,,,35000,,,,,,,0,0,0,0',
+        b'MSG,3,1,1,4CA2D,1,,,,,,35000,,,,,,,0,0,0,0',
+        b'MSG,3,1,1,4CA2D6F,1,,,,,,35000,,,,,,,0,0,0,0',
+        b'MSG,3,1,1,4CA2G6,1,,,,,,35000,,,,,,,0,0,0,0',
+    ])
+    def test_rejects_unusable_lines(self, line):
+        """Test non-MSG, truncated and ICAO-less or malformed-ICAO lines are rejected."""
+        assert parse_sbs_line(line) is None
@@ -1,7 +1,10 @@
 """Tests for utility modules."""
 
+import threading
+
 import pytest
 from utils.process import is_valid_mac, is_valid_channel
+from utils.sse import SSEBroadcast
 from utils.dependencies import check_tool
 from data.oui import get_manufacturer
 
@@ -71,3 +74,54 @@ class TestOuiLookup:
         """Test looking up unknown manufacturer."""
         result = get_manufacturer('FF:FF:FF:FF:FF:FF')
         assert result == 'Unknown'
+
+
+class TestSSEBroadcast:
+    """Tests for the shared SSE frame ring buffer."""
+
+    def test_subscribers_each_receive_frames(self):
+        """Test every subscriber reads the same frames independently."""
+        stream = SSEBroadcast(maxlen=8)
+        first = second = stream.latest()
+        stream.publish(b'data: 1\n\n')
+        stream.publish(b'data: 2\n\n')
+
+        first, frames_a, missed_a = stream.read(first, timeout=0)
+        second, frames_b, missed_b = stream.read(second, timeout=0)
+        assert frames_a == frames_b == [b'data: 1\n\n', b'data: 2\n\n']
+        assert not missed_a and not missed_b
+        assert stream.read(first, timeout=0) == (first, [], False)
+
+    def test_slow_subscriber_skips_overwritten_frames(self):
+        """Test a subscriber that falls behind only gets frames still buffered and is told so."""
+        stream = SSEBroadcast(maxlen=2)
+        seq = stream.latest()
+        for i in range(5):
+            stream.publish(str(i).encode())
+
+        seq, frames, missed = stream.read(seq, timeout=0)
+        assert frames == [b'3', b'4']
+        assert missed
+        assert seq == 5
+        assert len(stream) == 2
+        stream.publish(b'5')
+        assert stream.read(seq, timeout=0) == (6, [b'5'], False)
+
+    def test_subscriber_count(self):
+        """Test subscribe/unsubscribe track connected clients."""
+        stream = SSEBroadcast()
+        stream.publish(b'old')
+
+        assert stream.subscribe() == 1
+        assert stream.subscribers == 1
+        stream.unsubscribe()
+        stream.unsubscribe()
+        assert stream.subscribers == 0
+
+    def test_read_wakes_on_publish(self):
+        """Test a waiting subscriber is woken by a new frame."""
+        stream = SSEBroadcast()
+        seq = stream.latest()
+        threading.Timer(0.05, stream.publish, args=(b'x',)).start()
+
+        assert stream.read(seq, timeout=5) == (seq + 1, [b'x'], False)
@@ -0,0 +1,314 @@
+"""
+Structure-of-arrays store for live ADS-B aircraft state.
+
+Numeric state (altitude, position, speed, ...) lives in fixed-size NumPy
+columns indexed by row, with a dict mapping ICAO address to row. The SBS
+parser writes into the columns for every message; per-aircraft dicts are
+only materialised when a snapshot is published.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+from utils.sbs_parse import SBSMessage
+
+# Numeric columns: name -> (dtype, output type)
+NUMERIC_FIELDS: dict[str, tuple[Any, type]] = {
+    'altitude': (np.float32, int),
+    'lat': (np.float64, float),
+    'lon': (np.float64, float),
+    'speed': (np.float32, int),
+    'heading': (np.float32, int),
+    'vertical_rate': (np.float32, int),
+}
+
+# Object columns (strings or database values)
+OBJECT_FIELDS = ('registration', 'type_code', 'type_desc', 'callsign', 'squawk')
+
+# Snapshot key order, matching the dicts previously built by the parser
+SNAPSHOT_FIELDS = (
+    'registration', 'type_code', 'type_desc', 'callsign',
+    'altitude', 'lat', 'lon', 'speed', 'heading', 'vertical_rate', 'squawk',
+)
+
+# Change mask bits: one per snapshot field, plus SEEN which is set for every
+# message so aircraft reporting only unchanged values are still refreshed
+SEEN = 1
+FIELD_BITS: dict[str, int] = {name: 1 << (i + 1) for i, name in enumerate(SNAPSHOT_FIELDS)}
+ALL_FIELDS = SEEN | sum(FIELD_BITS.values())
+
+_INFO_BITS = FIELD_BITS['registration'] | FIELD_BITS['type_code'] | FIELD_BITS['type_desc']
+_CALLSIGN = FIELD_BITS['callsign']
+_ALTITUDE = FIELD_BITS['altitude']
+_POSITION = FIELD_BITS['lat'] | FIELD_BITS['lon']
+_SPEED = FIELD_BITS['speed']
+_HEADING = FIELD_BITS['heading']
+_VERTICAL_RATE = FIELD_BITS['vertical_rate']
+_SQUAWK = FIELD_BITS['squawk']
+_VELOCITY_FIELDS = (('speed', _SPEED), ('heading', _HEADING), ('vertical_rate', _VERTICAL_RATE))
+
+
+def _json_str(value: str) -> str:
+    # Callsigns and squawks are plain alphanumerics; escape anything else
+    if value.isalnum() and value.isascii():
+        return f'"{value}"'
+    return json.dumps(value)
+
+
+class AircraftTable:
+    """Fixed-capacity aircraft state table with one row per ICAO address."""
+
+    def __init__(self, capacity: int = 4096, max_age_seconds: float = 300.0,
+                 full_update_seconds: float = 30.0):
+        """
+        Initialize aircraft table.
+
+        Args:
+            capacity: Maximum number of aircraft tracked at once
+            max_age_seconds: Age after which an aircraft expires
+            full_update_seconds: Rows last published longer ago than this are
+                reported with all fields, so clients that dropped the aircraft
+                in the meantime get its full state back
+        """
+        self.capacity = capacity
+        self.max_age = max_age_seconds
+        self.full_update_after = full_update_seconds
+        self.icao = np.empty(capacity, dtype=object)
+        self.numeric = {
+            name: np.full(capacity, np.nan, dtype=dtype)
+            for name, (dtype, _) in NUMERIC_FIELDS.items()
+        }
+        self.objects = {name: np.empty(capacity, dtype=object) for name in OBJECT_FIELDS}
+        # Aircraft database fields pre-serialised as a JSON fragment (set once per aircraft)
+        self.info_json = np.empty(capacity, dtype=object)
+        self.last_seen = np.zeros(capacity, dtype=np.float64)
+        # Per-row change mask (FIELD_BITS | SEEN) accumulated since the last flush
+        self.dirty = np.zeros(capacity, dtype=np.uint16)
+        self.last_published = np.zeros(capacity, dtype=np.float64)
+        self.icao_to_row: dict[str, int] = {}
+        self._free_rows = list(range(capacity - 1, -1, -1))
+        self._evicted: list[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.icao_to_row)
+
+    def __contains__(self, icao: str) -> bool:
+        return icao in self.icao_to_row
+
+    def row_for(self, icao: str) -> tuple[int | None, bool]:
+        """
+        Get the row for an ICAO address, allocating one if needed.
+
+        When the table is full, the least recently seen aircraft is evicted
+        and reported by the next expire() call.
+
+        Returns:
+            Tuple of (row, created)
+        """
+        row = self.icao_to_row.get(icao)
+        if row is not None:
+            return row, False
+
+        with self._lock:
+            if not self._free_rows:
+                self._evicted.extend(self._remove_rows(self._stale_rows(time.time())))
+            if not self._free_rows:
+                # Every row is in use: evict the least recently seen aircraft
+                self._evicted.extend(self._remove_rows([np.argmin(self.last_seen)]))
+            row = self._free_rows.pop()
+            self._reset_row(row)
+            self.icao[row] = icao
+            self.icao_to_row[icao] = row
+        return row, True
+
+    def update(self, row: int, msg: SBSMessage, now: float) -> None:
+        """Apply the fields carried by a parsed SBS message to a row, recording which values changed."""
+        numeric = self.numeric
+        objects = self.objects
+        changed = SEEN
+        if msg.callsign is not None and objects['callsign'][row] != msg.callsign:
+            objects['callsign'][row] = msg.callsign
+            changed |= _CALLSIGN
+        if msg.altitude is not None and numeric['altitude'][row] != msg.altitude:
+            numeric['altitude'][row] = msg.altitude
+            changed |= _ALTITUDE
+        if msg.lat is not None and (numeric['lat'][row] != msg.lat or numeric['lon'][row] != msg.lon):
+            numeric['lat'][row] = msg.lat
+            numeric['lon'][row] = msg.lon
+            changed |= _POSITION
+        if msg.speed is not None and numeric['speed'][row] != msg.speed:
+            numeric['speed'][row] = msg.speed
+            changed |= _SPEED
+        if msg.heading is not None and numeric['heading'][row] != msg.heading:
+            numeric['heading'][row] = msg.heading
+            changed |= _HEADING
+        if msg.vertical_rate is not None and numeric['vertical_rate'][row] != msg.vertical_rate:
+            numeric['vertical_rate'][row] = msg.vertical_rate
+            changed |= _VERTICAL_RATE
+        if msg.squawk is not None and objects['squawk'][row] != msg.squawk:
+            objects['squawk'][row] = msg.squawk
+            changed |= _SQUAWK
+        self.last_seen[row] = now
+        self.dirty[row] |= changed
+
+    def set_info(self, row: int, info: dict[str, Any]) -> None:
+        """Store aircraft database details (registration, type) for a row."""
+        for name in ('registration', 'type_code', 'type_desc'):
+            value = info.get(name)
+            if value:
+                self.objects[name][row] = value
+        fragment = ','.join(
+            f'"{name}":{json.dumps(self.objects[name][row])}'
+            for name in ('registration', 'type_code', 'type_desc')
+            if self.objects[name][row] is not None
+        )
+        self.info_json[row] = fragment or None
+        self.dirty[row] |= _INFO_BITS
+
+    def take_dirty(self, now: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the rows updated since the last call and clear their change masks.
+
+        Rows not published within full_update_seconds (including new rows)
+        get ALL_FIELDS as their mask.
+
+        Returns:
+            Tuple of (rows, change masks)
+        """
+        if now is None:
+            now = time.time()
+        rows = np.flatnonzero(self.dirty)
+        masks = self.dirty[rows]
+        masks[self.last_published[rows] < now - self.full_update_after] = ALL_FIELDS
+        self.dirty[rows] = 0
+        self.last_published[rows] = now
+        return rows, masks
+
+    def snapshot(self, row: int) -> dict[str, Any]:
+        """Build the aircraft dict for a row, omitting fields never received."""
+        result: dict[str, Any] = {'icao': self.icao[row]}
+        for name in SNAPSHOT_FIELDS:
+            if name in self.numeric:
+                value = self.numeric[name][row]
+                if not np.isnan(value):
+                    result[name] = NUMERIC_FIELDS[name][1](value)
+            else:
+                value = self.objects[name][row]
+                if value is not None:
+                    result[name] = value
+        return result
+
+    def to_json(self, row: int, mask: int = ALL_FIELDS) -> str:
+        """
+        Serialise a row as a JSON object with the same keys as snapshot().
+
+        The schema is fixed, so the object is assembled directly with
+        f-strings instead of going through a generic JSON encoder.
+        Coordinates are rounded to 5 decimal places (about 1 m).
+
+        Args:
+            row: Table row
+            mask: Change mask from take_dirty(); only fields whose bits are
+                set are included (the ICAO address is always included)
+        """
+        numeric = self.numeric
+        fields = [f'"icao":"{self.icao[row]}"']
+        if mask & _INFO_BITS:
+            info = self.info_json[row]
+            if info is not None:
+                fields.append(info)
+        if mask & _CALLSIGN:
+            callsign = self.objects['callsign'][row]
+            if callsign is not None:
+                fields.append(f'"callsign":{_json_str(callsign)}')
+        if mask & _ALTITUDE:
+            altitude = numeric['altitude'][row]
+            if altitude == altitude:
+                fields.append(f'"altitude":{int(altitude)}')
+        if mask & _POSITION:
+            lat = numeric['lat'][row]
+            if lat == lat:
+                fields.append(f'"lat":{lat:.5f},"lon":{numeric["lon"][row]:.5f}')
+        for name, bit in _VELOCITY_FIELDS:
+            if mask & bit:
+                value = numeric[name][row]
+                if value == value:
+                    fields.append(f'"{name}":{int(value)}')
+        if mask & _SQUAWK:
+            squawk = self.objects['squawk'][row]
+            if squawk is not None:
+                fields.append(f'"squawk":{_json_str(squawk)}')
+        return '{' + ','.join(fields) + '}'
+
+    def remove(self, icao: str) -> bool:
+        """Remove an aircraft and free its row."""
+        with self._lock:
+            row = self.icao_to_row.pop(icao, None)
+            if row is None:
+                return False
+            self._reset_row(row)
+            self._free_rows.append(row)
+            return True
+
+    def clear(self) -> None:
+        """Remove all aircraft."""
+        with self._lock:
+            for column in self.numeric.values():
+                column.fill(np.nan)
+            for column in self.objects.values():
+                column.fill(None)
+            self.info_json.fill(None)
+            self.icao.fill(None)
+            self.last_seen.fill(0.0)
+            self.dirty.fill(0)
+            self.last_published.fill(0.0)
+            self.icao_to_row.clear()
+            self._free_rows = list(range(self.capacity - 1, -1, -1))
+            self._evicted = []
+
+    def _reset_row(self, row: int) -> None:
+        for column in self.numeric.values():
+            column[row] = np.nan
+        for column in self.objects.values():
+            column[row] = None
+        self.info_json[row] = None
+        self.icao[row] = None
+        self.last_seen[row] = 0.0
+        self.dirty[row] = 0
+        self.last_published[row] = 0.0
+
+    def expire(self, now: float) -> list[str]:
+        """
+        Remove aircraft not updated within max_age.
+
+        Returns:
+            ICAO addresses removed, including any evicted since the last call
+        """
+        with self._lock:
+            expired = self._evicted + self._remove_rows(self._stale_rows(now))
+            self._evicted = []
+        return expired
+
+    def _stale_rows(self, now: float) -> np.ndarray:
+        return np.flatnonzero((self.last_seen > 0) & (self.last_seen < now - self.max_age))
+
+    def _remove_rows(self, rows) -> list[str]:
+        """Free rows and return their ICAO addresses (caller holds the lock)."""
+        removed = []
+        for row in rows:
+            row = int(row)
+            icao = self.icao[row]
+            if icao is None:
+                continue
+            self.icao_to_row.pop(icao, None)
+            self._reset_row(row)
+            self._free_rows.append(row)
+            removed.append(icao)
+        return removed
@@ -46,6 +46,16 @@ SOCKET_CONNECT_TIMEOUT = 2
 # SBS stream socket timeout
 SBS_SOCKET_TIMEOUT = 5
 
+# SBS port availability probe: connect wait and how long a success is reused
+SBS_PROBE_TIMEOUT = 0.1
+SBS_PROBE_CACHE_SECONDS = 5.0
+
+# SBS stream kernel receive buffer (SO_RCVBUF) requested on connect
+SBS_SO_RCVBUF = 1 << 20  # 1 MiB
+
+# SBS stream user-space read buffer (reused for every recv_into call)
+SBS_READ_BUFFER_SIZE = 65536
+
 # Subprocess command timeout (short operations)
 SUBPROCESS_TIMEOUT_SHORT = 5
 
@@ -75,6 +85,10 @@ SSE_KEEPALIVE_INTERVAL = 30.0
 # Queue get timeout for SSE generators (seconds)
 SSE_QUEUE_TIMEOUT = 1.0
 
+# Frames kept for subscribers of broadcast SSE streams (only needs to cover
+# a client briefly falling behind; ~1 frame per second plus expiries)
+SSE_BROADCAST_BUFFER_SIZE = 64
+
 
 # =============================================================================
 # DATA RETENTION / CLEANUP (seconds)
@@ -92,6 +106,13 @@ MAX_BT_DEVICE_AGE_SECONDS = 300  # 5 minutes
 # ADS-B queue batch update interval
 ADSB_UPDATE_INTERVAL = 1.0  # seconds
 
+# Maximum number of aircraft held in the ADS-B state table
+ADSB_TABLE_CAPACITY = 4096
+
+# Send all fields (not just changed ones) for aircraft last published longer
+# ago than this; half the dashboard's 60 second aircraft timeout
+ADSB_FULL_UPDATE_SECONDS = 30.0
+
 
 # =============================================================================
 # QUEUE LIMITS
@@ -0,0 +1,155 @@
+"""
+SBS (BaseStation) message parser.
+
+Parses raw ``MSG`` lines from dump1090's SBS output (port 30003) directly
+from the ``bytes`` received on the socket, without decoding the whole line
+to ``str`` first. Only the fields used for live aircraft tracking are
+converted; everything else is left untouched.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, NamedTuple
+
+
+class SBSMessage(NamedTuple):
+    """Typed fields extracted from a single SBS ``MSG`` line."""
+
+    msg_type: int
+    icao: str
+    callsign: str | None = None
+    altitude: int | None = None
+    speed: int | None = None
+    heading: int | None = None
+    lat: float | None = None
+    lon: float | None = None
+    vertical_rate: int | None = None
+    squawk: str | None = None
+
+
+# Integer fields are stored in float32 columns, which hold integers exactly up to 2**24;
+# anything larger is not a real altitude/speed/heading/vertical rate
+_INT_LIMIT = 1 << 24
+
+
+def _to_int(field: bytes) -> int | None:
+    if not field:
+        return None
+    try:
+        value = int(field)
+    except ValueError:
+        try:
+            value = int(float(field))
+        except (ValueError, OverflowError):  # nan / inf
+            return None
+    return value if -_INT_LIMIT <= value <= _INT_LIMIT else None
+
+
+def _to_float(field: bytes) -> float | None:
+    if not field:
+        return None
+    try:
+        value = float(field)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _to_str(field: bytes) -> str | None:
+    field = field.strip()
+    if not field:
+        return None
+    return field.decode('ascii', errors='ignore') or None
+
+
+# Fields carried by each SBS message type: (field index, SBSMessage field, converter)
+_FIELD_SPECS: dict[int, tuple[tuple[int, str, Callable[[bytes], Any]], ...]] = {
+    1: ((10, 'callsign', _to_str),),
+    3: ((11, 'altitude', _to_int), (14, 'lat', _to_float), (15, 'lon', _to_float)),
+    4: ((12, 'speed', _to_int), (13, 'heading', _to_int), (16, 'vertical_rate', _to_int)),
+    5: ((10, 'callsign', _to_str), (11, 'altitude', _to_int)),
+    6: ((17, 'squawk', _to_str),),
+}
+
+_NUM_OPTIONAL_FIELDS = len(SBSMessage._fields) - 2
+_LAT_SLOT = SBSMessage._fields.index('lat') - 2
+_LON_SLOT = SBSMessage._fields.index('lon') - 2
+
+# Dispatch table built once from _FIELD_SPECS:
+# msg_type -> (minimum field count, ((field index, record slot, converter), ...))
+_HANDLERS: dict[int, tuple[int, tuple[tuple[int, int, Callable[[bytes], Any]], ...]]] = {
+    msg_type: (
+        max(index for index, _, _ in specs) + 1,
+        tuple((index, SBSMessage._fields.index(name) - 2, fn) for index, name, fn in specs),
+    )
+    for msg_type, specs in _FIELD_SPECS.items()
+}
+
+_HEX_DIGITS = b'0123456789ABCDEF'
+
+
+def _is_icao(field: bytes) -> bool:
+    # Six upper-case hex digits; dump1090-fa prefixes non-ICAO (TIS-B) addresses with '~'
+    if field[:1] == b'~':
+        field = field[1:]
+    return len(field) == 6 and not field.translate(None, _HEX_DIGITS)
+
+
+# Fields past the highest one we read are never split out
+_MAX_SPLIT = max(minimum for minimum, _ in _HANDLERS.values())
+
+
+def parse_sbs_line(buf: bytes, start: int = 0, end: int | None = None) -> SBSMessage | None:
+    """
+    Parse one SBS line held in ``buf[start:end]``.
+
+    Args:
+        buf: Raw bytes received from the SBS socket
+        start: Offset of the first byte of the line
+        end: Offset one past the last byte of the line (default: end of buffer)
+
+    Returns:
+        SBSMessage with the fields relevant to its message type, or None if
+        the line is not a usable ``MSG`` line
+    """
+    # Reject STA/AIR/ID/CLK lines before allocating anything
+    if not buf.startswith(b'MSG,', start, end):
+        return None
+
+    parts = buf[start:end].split(b',', _MAX_SPLIT)
+    if len(parts) < 11:
+        return None
+
+    # Message types are single ASCII digits, so skip int() for the common case
+    raw_type = parts[1]
+    if len(raw_type) == 1 and raw_type.isdigit():
+        msg_type = raw_type[0] - 0x30
+    else:
+        try:
+            msg_type = int(raw_type)
+        except ValueError:
+            return None
+
+    # dump1090 already emits upper-case hex, so only normalise when needed.
+    # The address is validated because it is written into JSON unescaped.
+    raw_icao = parts[4]
+    if not _is_icao(raw_icao):
+        raw_icao = raw_icao.strip().upper()
+        if not _is_icao(raw_icao):
+            return None
+    icao = raw_icao.decode('ascii')
+
+    handler = _HANDLERS.get(msg_type)
+    if handler is None or len(parts) < handler[0]:
+        return SBSMessage(msg_type, icao)
+
+    values: list[Any] = [None] * _NUM_OPTIONAL_FIELDS
+    for index, slot, fn in handler[1]:
+        values[slot] = fn(parts[index])
+
+    # A position is only usable when both coordinates are present
+    if values[_LAT_SLOT] is None or values[_LON_SLOT] is None:
+        values[_LAT_SLOT] = values[_LON_SLOT] = None
+
+    return SBSMessage(msg_type, icao, *values)
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import json
 import queue
+import threading
 import time
+from collections import deque
+from itertools import islice
 from typing import Any, Generator
 
 
@@ -87,3 +90,86 @@ def clear_queue(q: queue.Queue) -> int:
         except queue.Empty:
             break
     return count
+
+
+class SSEBroadcast:
+    """
+    Fan out pre-serialised SSE frames to any number of subscribers.
+
+    The producer formats each frame once and publishes it into a bounded
+    ring buffer; every subscriber keeps its own sequence number and reads
+    the frames it has not seen yet. Subscribers that fall more than
+    ``maxlen`` frames behind skip the frames that were overwritten, and
+    read() reports the gap so they can resynchronise.
+    """
+
+    def __init__(self, maxlen: int = 1024):
+        """
+        Initialize broadcast buffer.
+
+        Args:
+            maxlen: Number of most recent frames kept for subscribers
+        """
+        self._frames: deque[bytes] = deque(maxlen=maxlen)
+        self._next_seq = 0
+        self._subscribers = 0
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._frames)
+
+    def publish(self, frame: bytes) -> None:
+        """Append a frame and wake all waiting subscribers."""
+        with self._cond:
+            self._frames.append(frame)
+            self._next_seq += 1
+            self._cond.notify_all()
+
+    def latest(self) -> int:
+        """Sequence number a new subscriber should start reading from."""
+        with self._cond:
+            return self._next_seq
+
+    @property
+    def subscribers(self) -> int:
+        """Number of clients currently subscribed."""
+        with self._cond:
+            return self._subscribers
+
+    def subscribe(self) -> int:
+        """
+        Register a subscriber.
+
+        Returns:
+            Sequence number to start reading from
+        """
+        with self._cond:
+            self._subscribers += 1
+            return self._next_seq
+
+    def unsubscribe(self) -> None:
+        """Unregister a subscriber (call when the client disconnects)."""
+        with self._cond:
+            self._subscribers = max(0, self._subscribers - 1)
+
+    def read(self, since: int, timeout: float = 1.0) -> tuple[int, list[bytes], bool]:
+        """
+        Get frames published since a sequence number, waiting if there are none.
+
+        Args:
+            since: Sequence number returned by the previous read (or latest())
+            timeout: Seconds to wait for a new frame
+
+        Returns:
+            Tuple of (next sequence number, frames, whether frames were missed
+            because they were overwritten before this read)
+        """
+        with self._cond:
+            if since >= self._next_seq:
+                self._cond.wait(timeout)
+            first_seq = self._next_seq - len(self._frames)
+            missed = since < first_seq
+            start = max(since, first_seq)
+            frames = list(islice(self._frames, start - first_seq, None))
+            return self._next_seq, frames, missed